@@ -18,6 +18,13 @@ def config_file(touch=False):
     return expanded_config_path
 
 
+def deep_get(dictionary, key_1, key_2):
+    if key_1 not in dictionary:
+        return None
+    else:
+        return dictionary[key_1].get(key_2)
+
+
 @click.group()
 def cli():
     """Download books from a Goodreads shelf using Library Genesis."""
@@ -35,7 +42,13 @@ def cli():
     multiple=True,
     help="Format of the eBooks to download, in order of preference.",
 )
-def configure(key, username, shelf, language, extension):
+@click.option(
+    "--catalog",
+    "-c",
+    type=click.Path(exists=True, dir_okay=False),
+    help="Path of a local catalog to search instead of Libgen.",
+)
+def configure(key, username, shelf, language, extension, catalog):
     """Configure Goodreads secrets and Libgen download preferences.
 
     Configurations are stored in "~/.goodlibs/config".
@@ -55,6 +68,8 @@ def configure(key, username, shelf, language, extension):
     config["Library Genesis"]["extensions"] = (
         None if extension == () else ", ".join(extension)
     ) or config["Library Genesis"].get("extensions")
+    if catalog is not None:
+        config["Library Genesis"]["catalog"] = catalog
 
     config.write(config_file().open("w"))
 
@@ -70,18 +85,23 @@ def configure(key, username, shelf, language, extension):
     multiple=True,
     help="Format of the eBooks to download, in order of preference.",
 )
-def download(key, username, shelf, language, extension):
+@click.option(
+    "--catalog",
+    "-c",
+    type=click.Path(exists=True, dir_okay=False),
+    help="Path of a local catalog to search instead of Libgen.",
+)
+@click.option(
+    "--by-author",
+    is_flag=True,
+    help="Search for all the books of an author at once, to make fewer searches.",
+)
+def download(key, username, shelf, language, extension, catalog, by_author):
     """Download books from Libgen."""
     # Read config file.
     config = ConfigParser()
     config.read(config_file())
 
-    def deep_get(dictionary, key_1, key_2):
-        if key_1 not in dictionary:
-            return None
-        else:
-            return dictionary[key_1].get(key_2)
-
     # Validate options and fall back to stored configurations or defaults.
     if key is None:
         if deep_get(config, "Goodreads", "api_key") is not None:
@@ -119,8 +139,52 @@ def download(key, username, shelf, language, extension):
         else:
             extension = ("mobi", "epub", "pdf")
 
+    if catalog is None:
+        catalog = deep_get(config, "Library Genesis", "catalog")
+        if catalog is not None and not os.path.isfile(catalog):
+            raise click.UsageError(
+                f'The configured catalog "{catalog}" doesn\'t exist. '
+                'Import a dump with "goodlibs import-catalog" or configure another catalog.'
+            )
+
     # Get the list of books from Goodreads.
     books = goodreads.get_books(api_key=key, username=username, shelf_name=shelf)
 
     # Query Libgen with the list of books.
-    libgen.download_books(books=books, language=language, extensions=extension)
+    libgen.download_books(
+        books=books,
+        language=language,
+        extensions=extension,
+        catalog=catalog,
+        by_author=by_author,
+    )
+
+
+@cli.command("import-catalog")
+@click.argument("dump", type=click.Path(exists=True, dir_okay=False))
+@click.option("--catalog", "-c", help="Path of the local catalog to import the dump into.")
+def import_catalog(dump, catalog):
+    """Import a Libgen database dump into a local catalog.
+
+    DUMP is a (possibly gzipped) MySQL dump of the Libgen "updated" table.
+    Importing a newer dump updates the catalog incrementally.
+    """
+    config = ConfigParser()
+    config.read(config_file())
+
+    if catalog is None:
+        if deep_get(config, "Library Genesis", "catalog") is not None:
+            catalog = config["Library Genesis"]["catalog"]
+        else:
+            catalog_path = Path("~/.goodlibs/catalog.sqlite").expanduser()
+            catalog_path.parent.mkdir(exist_ok=True)
+            catalog = str(catalog_path)
+
+    local_catalog = libgen.Catalog(catalog)
+    try:
+        with libgen.catalog.open_dump(dump) as f:
+            imported = local_catalog.import_dump(f)
+    finally:
+        local_catalog.close()
+
+    click.echo(message=f'Imported {imported} publications into "{catalog}".')
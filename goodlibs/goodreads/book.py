@@ -7,16 +7,23 @@ from unidecode import unidecode
 
 
 class Book:
+    __slots__ = ("_book_dict", "_query", "_author_query")
+
     def __init__(self, book_dict):
         self._book_dict = book_dict
+        self._query = None
+        self._author_query = None
 
     def __repr__(self):
         """String representation used for queries."""
-        author = unidecode(self.author or "").lower()  # Transliterate and lowercase.
-        author_words = re.split("[\W\s]", author)  # noqa = W605  # Remove punctuation.
-        author_words = [
-            word for word in author_words if len(word) > 1 and word not in ("jr", "sr", "ii", "iii")
-        ]  # Remove initials and suffixes.
+        # The query is normalized once and memoized.
+        if self._query is None:
+            self._query = self.normalize_query()
+        return self._query
+
+    def normalize_query(self):
+        """Returns the transliterated and lowercase author and title words of the book."""
+        author_words = self.author_query.split()
 
         title = unidecode(
             self.short_title
@@ -26,6 +33,22 @@ class Book:
         words = [word.strip() for word in author_words + title_words]  # Strip spaces.
         return " ".join(words)  # Lower case.
 
+    @property
+    def author_query(self):
+        """String representation used for queries of all the books of the author."""
+        # The query is normalized once and memoized.
+        if self._author_query is None:
+            self._author_query = " ".join(word.strip() for word in self.author_words())
+        return self._author_query
+
+    def author_words(self):
+        """Returns the transliterated and lowercase words of the author name."""
+        author = unidecode(self.author or "").lower()  # Transliterate and lowercase.
+        author_words = re.split("[\W\s]", author)  # noqa = W605  # Remove punctuation.
+        return [
+            word for word in author_words if len(word) > 1 and word not in ("jr", "sr", "ii", "iii")
+        ]  # Remove initials and suffixes.
+
     @property
     def title(self):
         """Returns the title of the book (without the series)."""
@@ -50,6 +73,13 @@ class Book:
             return None
         return author_name
 
+    @property
+    def isbns(self):
+        """Returns the list of known ISBNs of the book."""
+        # Unknown ISBNs are returned by the API as nil elements, which are parsed as dicts.
+        isbns = [self._book_dict.get("isbn13"), self._book_dict.get("isbn")]
+        return [isbn for isbn in isbns if isinstance(isbn, str)]
+
 
 def get_books(api_key, username, shelf_name="to-read"):
     # Configure logger.
@@ -1 +1,2 @@
+from goodlibs.libgen.catalog import Catalog  # noqa: F401
 from goodlibs.libgen.downloaders import download_books  # noqa: F401
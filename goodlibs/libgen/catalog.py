@@ -0,0 +1,272 @@
+"""Local catalog module.
+
+Imports Library Genesis metadata dumps into a SQLite full-text index so that
+searches can be answered locally instead of paging through "search.php".
+"""
+
+import gzip
+import re
+import sqlite3
+from typing import Any, Dict, Generator, Iterable, List, Optional, TextIO
+
+from unidecode import unidecode
+
+RE_COLUMN = re.compile(r"^\s*`(\w+)`")
+
+RE_TOKEN = re.compile(r"'((?:[^'\\]|\\.|'')*)'|(NULL)|([^\s,();']+)|([(),;])", re.S)
+
+RE_ESCAPE = re.compile(r"\\(.)", re.S)
+
+RE_WORD = re.compile(r"\w+")
+
+ESCAPES = {"0": "\0", "b": "\b", "n": "\n", "r": "\r", "t": "\t", "Z": "\x1a"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS publications (
+    id INTEGER PRIMARY KEY,
+    md5 TEXT,
+    title TEXT,
+    authors TEXT,
+    series TEXT,
+    edition TEXT,
+    publisher TEXT,
+    year TEXT,
+    pages TEXT,
+    lang TEXT,
+    size INTEGER,
+    extension TEXT,
+    modified TEXT
+);
+CREATE TABLE IF NOT EXISTS isbns (
+    isbn TEXT NOT NULL,
+    id INTEGER NOT NULL,
+    PRIMARY KEY (isbn, id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS isbns_id ON isbns (id);
+CREATE VIRTUAL TABLE IF NOT EXISTS publications_fts USING fts5(
+    authors, title, tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+# Maps the columns of the Libgen "updated" table to the catalog columns.
+DUMP_COLUMNS = {
+    "ID": "id",
+    "MD5": "md5",
+    "Title": "title",
+    "Author": "authors",
+    "Series": "series",
+    "Edition": "edition",
+    "Publisher": "publisher",
+    "Year": "year",
+    "Pages": "pages",
+    "Language": "lang",
+    "Filesize": "size",
+    "Extension": "extension",
+    "TimeLastModified": "modified",
+    "IdentifierWODash": "identifier",
+}
+
+
+def normalize(text: Optional[str]) -> str:
+    """Returns the transliterated, lowercase words of 'text' joined by spaces."""
+    return " ".join(RE_WORD.findall(unidecode(text or "").lower()))
+
+
+def normalize_isbn(isbn: Optional[str]) -> Optional[str]:
+    """Returns 'isbn' without dashes and spaces, or None if it isn't an ISBN."""
+    isbn = re.sub(r"[^0-9Xx]", "", isbn or "").upper()
+    return isbn if len(isbn) in (10, 13) else None
+
+
+def open_dump(path: str) -> TextIO:
+    """Opens a (possibly gzipped) SQL dump for reading."""
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8", errors="replace")
+    return open(path, "r", encoding="utf-8", errors="replace")
+
+
+def unescape(value: str) -> str:
+    """Unescapes a MySQL string literal."""
+    value = value.replace("''", "'")
+    return RE_ESCAPE.sub(lambda m: ESCAPES.get(m.group(1), m.group(1)), value)
+
+
+def parse_values(statement: str) -> Generator[List[Optional[str]], None, None]:
+    """Yields the rows of the VALUES clause of an INSERT statement."""
+    row = None
+    for string, null, literal, punct in RE_TOKEN.findall(statement):
+        if punct == "(":
+            row = []
+        elif punct == ")":
+            if row is not None:
+                yield row
+            row = None
+        elif punct or row is None:
+            continue
+        elif null:
+            row.append(None)
+        elif literal:
+            row.append(literal)
+        else:
+            row.append(unescape(string))
+
+
+def parse_dump(
+    dump: Iterable[str], table: str = "updated"
+) -> Generator[Dict[str, Any], None, None]:
+    """Streams the rows of 'table' from a MySQL dump of the Libgen database.
+
+    The column order is read from the CREATE TABLE statement so that dumps of
+    different schema versions can be imported.
+
+    :param dump: iterable of lines of the dump
+    :param table: name of the table holding the book metadata
+    :returns: dicts mapping the Libgen column names to the row values
+    """
+    create_prefix = f"CREATE TABLE `{table}`"
+    insert_prefix = f"INSERT INTO `{table}`"
+    columns = []
+    in_create = False
+    for line in dump:
+        if in_create:
+            match = RE_COLUMN.match(line)
+            if match:
+                columns.append(match.group(1))
+            elif line.startswith(")"):
+                in_create = False
+        elif line.startswith(create_prefix):
+            columns = []
+            in_create = True
+        elif line.startswith(insert_prefix):
+            if not columns:
+                raise ValueError(f'The dump doesn\'t define the columns of the "{table}" table.')
+            values = line[line.index(" VALUES ") + len(" VALUES ") :]
+            for row in parse_values(values):
+                yield dict(zip(columns, row))
+
+
+class Catalog(object):
+    """Local full-text index of Libgen publications backed by SQLite."""
+
+    def __init__(self, path: str) -> None:
+        """Opens (and creates, if needed) a catalog.
+
+        :param path: path of the SQLite database file
+        :rtype: None
+        """
+        self.path = path
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.executescript(SCHEMA)
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}: {self.path}>"
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def import_dump(
+        self, dump: Iterable[str], table: str = "updated", batch_size: int = 10000
+    ) -> int:
+        """Imports a Libgen metadata dump into the catalog.
+
+        Rows which are already in the catalog are only replaced if the dump
+        holds a more recent version, so newer dumps can be imported on top of
+        older ones to update the catalog incrementally.
+
+        :param dump: iterable of lines of the dump
+        :param table: name of the table holding the book metadata
+        :param batch_size: number of rows to import per transaction
+        :returns: number of imported rows
+        """
+        imported = 0
+        batch = []
+        for row in parse_dump(dump, table):
+            batch.append({DUMP_COLUMNS[k]: v for k, v in row.items() if k in DUMP_COLUMNS})
+            if len(batch) >= batch_size:
+                imported += self._import_rows(batch)
+                batch = []
+        imported += self._import_rows(batch)
+        return imported
+
+    def _import_rows(self, rows: List[Dict[str, Any]]) -> int:
+        imported = 0
+        with self.connection:
+            for row in rows:
+                row_id = int(row["id"])
+                stored = self.connection.execute(
+                    "SELECT * FROM publications WHERE id = ?", (row_id,)
+                ).fetchone()
+                if stored is not None:
+                    if (stored["modified"] or "") >= (row.get("modified") or ""):
+                        continue
+                    self.connection.execute(
+                        "DELETE FROM publications_fts WHERE rowid = ?", (row_id,)
+                    )
+                    if "identifier" in row:
+                        self.connection.execute("DELETE FROM isbns WHERE id = ?", (row_id,))
+                    # Keep the stored values of the columns which aren't in the dump.
+                    row = {**dict(stored), **row}
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO publications VALUES "
+                    "(:id, :md5, :title, :authors, :series, :edition, :publisher, "
+                    ":year, :pages, :lang, :size, :extension, :modified)",
+                    {column: row.get(column) for column in DUMP_COLUMNS.values()},
+                )
+                self.connection.execute(
+                    "INSERT INTO publications_fts (rowid, authors, title) VALUES (?, ?, ?)",
+                    (row_id, normalize(row.get("authors")), normalize(row.get("title"))),
+                )
+                isbns = {normalize_isbn(isbn) for isbn in (row.get("identifier") or "").split(",")}
+                self.connection.executemany(
+                    "INSERT OR IGNORE INTO isbns VALUES (?, ?)",
+                    [(isbn, row_id) for isbn in isbns if isbn is not None],
+                )
+                imported += 1
+        return imported
+
+    def search(
+        self, search_term: str, isbns: Iterable[str] = (), limit: int = 100, offset: int = 0
+    ) -> List[sqlite3.Row]:
+        """Searches the catalog.
+
+        Publications matching one of the ISBNs come first, followed by the
+        publications whose authors and title contain every word of the search
+        term, best matches first. Publications without an MD5 can't be
+        downloaded and are left out.
+
+        :param search_term: words to look for in the authors and titles
+        :param isbns: ISBNs of the publication
+        :param limit: maximum number of rows to return
+        :param offset: number of rows to skip
+        :returns: list of publication rows
+        """
+        isbns = [isbn for isbn in map(normalize_isbn, isbns) if isbn is not None]
+        words = normalize(search_term).split()
+        isbn_ids = f"SELECT id FROM isbns WHERE isbn IN ({', '.join('?' * len(isbns))})"
+
+        queries = []
+        parameters = []
+        if isbns:
+            queries.append(
+                "SELECT p.*, 0 AS source, 0 AS score FROM publications p "
+                f"WHERE p.md5 IS NOT NULL AND p.id IN ({isbn_ids})"
+            )
+            parameters.extend(isbns)
+        if words:
+            # Leave out the ISBN matches, which are already in the results.
+            queries.append(
+                "SELECT p.*, 1 AS source, f.rank AS score "
+                "FROM publications_fts f JOIN publications p ON p.id = f.rowid "
+                "WHERE publications_fts MATCH ? AND p.md5 IS NOT NULL"
+                + (f" AND p.id NOT IN ({isbn_ids})" if isbns else "")
+            )
+            parameters.append(" ".join(f'"{word}"' for word in words))
+            parameters.extend(isbns)
+        if not queries:
+            return []
+
+        return self.connection.execute(
+            " UNION ALL ".join(queries) + " ORDER BY source, score, id LIMIT ? OFFSET ?",
+            (*parameters, limit, offset),
+        ).fetchall()
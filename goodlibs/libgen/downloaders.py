@@ -9,6 +9,7 @@ from typing import Optional
 from bs4 import BeautifulSoup
 
 from goodlibs.libgen import mirrors
+from goodlibs.libgen.catalog import Catalog
 from goodlibs.libgen.exceptions import CouldntFindDownloadUrl
 from goodlibs.libgen.utils import random_string
 
@@ -105,26 +106,62 @@ class BOkCcDownloader(MirrorDownloader):
         raise Exception("The b-ok.cc MirrorDownloader is broken.")
 
 
-def download_books(books, language="English", extensions=("mobi", "epub", "pdf")):
-    for book in books:
-        # Configure logger.
-        logger = logging.getLogger(book.short_title)
-        handler = logging.StreamHandler()
-        formatter = logging.Formatter("%(asctime)s %(levelname)s (%(name)s): %(message)s")
-        handler.setFormatter(formatter)
-        logger.addHandler(handler)
-        logger.setLevel(logging.DEBUG)
-
-        mirror = mirrors.find_mirror(book)
-        if mirror is None:
-            logger.error("Unable to find an active mirror. Skipping.")
-            continue
-        results = mirror.get_results()
-        selected = mirror.select_result(results, language, extensions)
-        if selected:
-            logger.info("Found book.")
-            downloader = Thread(target=mirror.download, args=[selected])
-            downloader.start()
-        else:
-            logger.info("No results found for the specified language and extensions.")
-            pass
+DOWNLOADERS = {
+    "libgen.is": LibgenIsDownloader,
+    "libgen.lc": LibgenLcDownloader,
+    "b-ok.cc": BOkCcDownloader,
+}
+
+
+def download_books(
+    books, language="English", extensions=("mobi", "epub", "pdf"), catalog=None, by_author=False
+):
+    """Searches for and downloads every book.
+
+    Identical searches are only made once per run, and publications are only
+    downloaded once even if several books match them.
+
+    :param catalog: path of a local catalog to search instead of the Libgen mirrors
+    :param by_author: whether to search for all the books of an author with several books at once
+    """
+    if catalog is not None and not os.path.isfile(catalog):
+        # Don't let SQLite create an empty catalog, which wouldn't find any book.
+        raise FileNotFoundError(f'The catalog "{catalog}" doesn\'t exist.')
+    local_catalog = None if catalog is None else Catalog(catalog)
+    mirror_class = None
+    books = list(books)
+    searches = mirrors.SearchCache(books, by_author=by_author)
+    downloading = set()
+    try:
+        for book in books:
+            # Configure logger.
+            logger = logging.getLogger(book.short_title)
+            handler = logging.StreamHandler()
+            formatter = logging.Formatter("%(asctime)s %(levelname)s (%(name)s): %(message)s")
+            handler.setFormatter(formatter)
+            logger.addHandler(handler)
+            logger.setLevel(logging.DEBUG)
+
+            if local_catalog is not None:
+                mirror = mirrors.LocalCatalog(book, local_catalog)
+            else:
+                # Only look for an active mirror once per run.
+                mirror_class = mirror_class or mirrors.find_mirror_class()
+                mirror = None if mirror_class is None else mirror_class(book=book)
+            if mirror is None:
+                logger.error("Unable to find an active mirror. Skipping.")
+                continue
+            selected = searches.select_result(mirror, language, extensions)
+            if selected and selected.id in downloading:
+                logger.info("Found book, which is already being downloaded. Skipping.")
+            elif selected:
+                logger.info("Found book.")
+                downloading.add(selected.id)
+                downloader = Thread(target=mirror.download, args=[selected])
+                downloader.start()
+            else:
+                logger.info("No results found for the specified language and extensions.")
+                pass
+    finally:
+        if local_catalog is not None:
+            local_catalog.close()
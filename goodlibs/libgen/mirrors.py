@@ -3,7 +3,8 @@ import itertools
 import logging
 import re
 from abc import ABC
-from typing import Any, Dict, Generator, List, Optional
+from collections import Counter
+from typing import Any, Dict, Generator, Iterable, List, Optional, Tuple
 
 import bs4
 from bs4 import BeautifulSoup
@@ -11,8 +12,10 @@ from bs4 import BeautifulSoup
 from fuzzywuzzy import fuzz
 
 from goodlibs.libgen import downloaders
+from goodlibs.libgen.catalog import Catalog
 from goodlibs.libgen.exceptions import CouldntFindDownloadUrl, NoResults
 from goodlibs.libgen.publication import Publication
+from goodlibs.libgen.utils import format_size
 
 import requests
 from requests.adapters import HTTPAdapter
@@ -27,7 +30,17 @@ RE_EDITION = re.compile(r"(\[[0-9] ed\.\])")
 
 
 class Mirror(ABC):
-    def __init__(self, search_url: str, book) -> None:
+    # Whether 'search' can look up publications by ISBN.
+    searches_isbns = False
+
+    def __init__(self, search_url: Optional[str], book) -> None:
+        """Constructs a new Mirror.
+
+        :param search_url: URL of the search page, or None for mirrors which
+            aren't searched over HTTP
+        :param book: the book to search for
+        :rtype: None
+        """
         self.search_url = search_url
 
         self.book = book
@@ -51,19 +64,25 @@ class Mirror(ABC):
         first = next(iter(links), None)
         return None if first is None else first.get("href")
 
-    def search(self, start_at: int = 1) -> Generator[bs4.BeautifulSoup, None, None]:
+    def search(
+        self, start_at: int = 1, search_term: Optional[str] = None, isbns: Iterable[str] = ()
+    ) -> Generator[bs4.BeautifulSoup, None, None]:
         """
         Yield result pages for a given search term.
 
         :param start_at: results page to start at
+        :param search_term: search term, defaults to the one of the book
+        :param isbns: ISBNs to look up, if the mirror 'searches_isbns'
         :returns: BeautifulSoup4 object representing a result page
         """
-        if len(self.search_term) < 3:
+        if search_term is None:
+            search_term = self.search_term
+        if len(search_term) < 3:
             raise ValueError("Your search term must be at least 3 characters long.")
 
-        self.logger.info(f'Searching for "{self.search_term}".')
+        self.logger.info(f'Searching for "{search_term}".')
 
-        for page_url in self.next_page_url(start_at):
+        for page_url in self.next_page_url(start_at, search_term):
             r = self.session.get(page_url)
             if r.status_code == 200:
                 publications = self.extract(BeautifulSoup(r.text, "html.parser"))
@@ -74,7 +93,7 @@ class Mirror(ABC):
                     yield publications
 
     @abc.abstractmethod
-    def next_page_url(self, start_at: int) -> Generator[str, None, None]:
+    def next_page_url(self, start_at: int, search_term: str) -> Generator[str, None, None]:
         """Yields the new results page."""
         raise NotImplementedError
 
@@ -87,10 +106,16 @@ class Mirror(ABC):
         """
         raise NotImplementedError
 
-    def get_results(self):
+    def get_results(
+        self,
+        search_term: Optional[str] = None,
+        isbns: Iterable[str] = (),
+        max_pages: Optional[int] = None,
+    ):
         results = []
         try:
-            for publications in self.search():
+            pages = self.search(search_term=search_term, isbns=isbns)
+            for publications in itertools.islice(pages, max_pages):
                 results.extend(publications)
         except NoResults:
             pass
@@ -124,7 +149,9 @@ class Mirror(ABC):
 
         :param publication: a Publication
         """
-        for (n, mirror) in publication.mirrors.items():
+        for (n, url) in publication.mirrors:
+            # Only construct the MirrorDownloaders of the publication being downloaded.
+            mirror = downloaders.DOWNLOADERS[n](url, self.logger)
             try:
                 mirror.download_publication(self.session, publication)
                 break  # stop if successful
@@ -144,10 +171,10 @@ class GenLibRusEc(Mirror):
     def __init__(self, book) -> None:
         super().__init__(self.search_url, book)
 
-    def next_page_url(self, start_at: int) -> Generator[str, None, None]:
+    def next_page_url(self, start_at: int, search_term: str) -> Generator[str, None, None]:
         """Yields the new results page."""
         for pn in itertools.count(start_at):
-            yield f"{self.search_url}{self.search_term}&page={str(pn)}"
+            yield f"{self.search_url}{search_term}&page={str(pn)}"
 
     def extract(self, page):
         """Extract all the publications info in a given result page.
@@ -160,7 +187,7 @@ class GenLibRusEc(Mirror):
         for row in rows[1:]:
             cells = row.find_all("td")
             attrs = self.extract_attributes(cells)
-            results.append(Publication(attrs))
+            results.append(Publication(**attrs))
         return results
 
     def extract_attributes(self, cells) -> Dict[str, Any]:
@@ -204,11 +231,11 @@ class GenLibRusEc(Mirror):
         libgen_lc_url = Mirror.get_href(cells[10])
         b_ok_cc_url = Mirror.get_href(cells[11])
 
-        attrs["mirrors"] = {
-            "libgen.is": downloaders.LibgenIsDownloader(libgen_is_url, self.logger),
-            "libgen.lc": downloaders.LibgenLcDownloader(libgen_lc_url, self.logger),
-            "b-ok.cc": downloaders.BOkCcDownloader(b_ok_cc_url, self.logger),
-        }
+        attrs["mirrors"] = (
+            ("libgen.is", libgen_is_url),
+            ("libgen.lc", libgen_lc_url),
+            ("b-ok.cc", b_ok_cc_url),
+        )
         return attrs
 
 
@@ -216,12 +243,180 @@ class LibGenIs(GenLibRusEc):
     search_url = "https://libgen.is/search.php?req="
 
 
+class LocalCatalog(Mirror):
+    """Mirror which searches a local :class:`Catalog` instead of a Libgen website."""
+
+    page_size = 100
+    searches_isbns = True
+
+    def __init__(self, book, catalog: Catalog) -> None:
+        super().__init__(None, book)
+        self.catalog = catalog
+
+    def search(
+        self, start_at: int = 1, search_term: Optional[str] = None, isbns: Iterable[str] = ()
+    ) -> Generator[List[Publication], None, None]:
+        """
+        Yield result pages for a given search term from the local catalog.
+
+        :param start_at: results page to start at
+        :param search_term: search term, defaults to the one of the book
+        :param isbns: ISBNs to look up before searching for the search term
+        :returns: list of :class:`Publication` objects
+        """
+        if search_term is None:
+            search_term = self.search_term
+
+        query = " ".join([search_term, *isbns]).strip()
+        self.logger.info(f'Searching the local catalog for "{query}".')
+
+        for offset in self.next_page_url(start_at, search_term):
+            rows = self.catalog.search(search_term, isbns, limit=self.page_size, offset=offset)
+            publications = self.extract(rows)
+
+            if not publications:
+                raise NoResults
+            else:
+                yield publications
+
+    def next_page_url(self, start_at: int, search_term: str) -> Generator[int, None, None]:
+        """Yields the offset of the new results page."""
+        for pn in itertools.count(start_at):
+            yield (pn - 1) * self.page_size
+
+    def extract(self, page):
+        """Extract all the publications info in a given result page.
+
+        :param page: list of catalog rows
+        :returns: list of Publication
+        """
+        return [Publication(**self.extract_attributes(row)) for row in page]
+
+    def extract_attributes(self, row) -> Dict[str, Any]:
+        attrs = {
+            key: row[key]
+            for key in (
+                "id",
+                "authors",
+                "title",
+                "series",
+                "edition",
+                "publisher",
+                "year",
+                "pages",
+                "lang",
+                "extension",
+            )
+            if row[key]
+        }
+        attrs["id"] = str(row["id"])
+        if row["size"]:
+            attrs["size"] = format_size(int(row["size"]))
+
+        md5 = row["md5"]
+        attrs["mirrors"] = (
+            ("libgen.is", f"http://library.lol/main/{md5}"),
+            ("libgen.lc", f"http://libgen.lc/ads.php?md5={md5}"),
+            ("b-ok.cc", f"https://b-ok.cc/md5/{md5}"),
+        )
+        return attrs
+
+
 MIRRORS = {"http://gen.lib.rus.ec": GenLibRusEc, "https://libgen.is": LibGenIs}
 
 
-def find_mirror(book):
+def find_mirror_class():
     for homepage, mirror in MIRRORS.items():
         homepage_response = requests.get(homepage)
         if homepage_response.status_code == 200:
-            return mirror(book=book)
+            return mirror
     return None
+
+
+def find_mirror(book):
+    mirror = find_mirror_class()
+    return None if mirror is None else mirror(book=book)
+
+
+class SearchCache(object):
+    """Shares search results among the books of a run.
+
+    Books with the same search term are only searched for once. When
+    'by_author' is set, all the books by an author are looked up in a single
+    search for the author, and the results are ranked per title; books whose
+    title isn't among the results fall back to their own search. Books with a
+    known ISBN are looked up by ISBN first, on mirrors which support it.
+
+    An author search can page through many more results than a search for a
+    single book, so it is only made for authors with several books in the run,
+    and it stops after a few pages.
+    """
+
+    def __init__(
+        self,
+        books: Iterable = (),
+        by_author: bool = False,
+        min_author_books: int = 2,
+        max_author_pages: int = 3,
+        min_title_ratio: int = 80,
+    ) -> None:
+        """Constructs a new SearchCache.
+
+        :param books: the books of the run
+        :param by_author: whether to search for the books of an author at once
+        :param min_author_books: minimum number of books by an author in the run
+            to search for the books of the author at once
+        :param max_author_pages: maximum number of result pages of an author search
+        :param min_title_ratio: minimum similarity of the book title to the title
+            of a result of an author search
+        :rtype: None
+        """
+        self.by_author = by_author
+        self.author_books = Counter(book.author_query for book in books) if by_author else Counter()
+        self.min_author_books = min_author_books
+        self.max_author_pages = max_author_pages
+        self.min_title_ratio = min_title_ratio
+        self.results: Dict[Tuple[str, Tuple[str, ...]], List[Publication]] = {}
+
+    def get_results(
+        self,
+        mirror: Mirror,
+        search_term: str,
+        isbns: Iterable[str] = (),
+        max_pages: Optional[int] = None,
+    ) -> List[Publication]:
+        """Returns the results for 'search_term' and 'isbns', searching for them only once."""
+        key = (search_term, tuple(isbns))
+        if key not in self.results:
+            self.results[key] = mirror.get_results(search_term, isbns, max_pages)
+        else:
+            query = " ".join([search_term, *key[1]]).strip()
+            mirror.logger.info(f'Reusing the results for "{query}".')
+        return self.results[key]
+
+    def select_result(self, mirror: Mirror, language, extensions) -> Optional[Publication]:
+        """Returns the result matching the preferences for the book of 'mirror', if any."""
+        book = mirror.book
+        isbns = tuple(book.isbns) if mirror.searches_isbns else ()
+        if (
+            len(book.author_query) >= 3
+            and self.author_books[book.author_query] >= self.min_author_books
+        ):
+            # An exact ISBN match beats ranking the author's books by title.
+            if isbns:
+                results = self.get_results(mirror, "", isbns)
+                selected = mirror.select_result(results, language, extensions)
+                if selected is not None:
+                    return selected
+
+            results = self.get_results(mirror, book.author_query, max_pages=self.max_author_pages)
+            selected = mirror.select_result(results, language, extensions)
+            if (
+                selected is not None
+                and fuzz.ratio(book.short_title.lower(), (selected.title or "").lower())
+                >= self.min_title_ratio
+            ):
+                return selected
+
+        results = self.get_results(mirror, str(book), isbns)
+        return mirror.select_result(results, language, extensions)
@@ -1,4 +1,4 @@
-from typing import Any, Dict, Optional
+from typing import Any, Dict, KeysView, Optional, ValuesView
 
 from goodlibs.libgen.utils import random_string
 
@@ -7,46 +7,71 @@ class Publication(object):
     """Publication is a class where the attributes of each
     of its objects are passed to the constructor."""
 
-    def __init__(self, attrs: Dict[str, Any]) -> None:
+    __slots__ = (
+        "id",
+        "authors",
+        "title",
+        "series",
+        "edition",
+        "isbn",
+        "publisher",
+        "year",
+        "pages",
+        "lang",
+        "size",
+        "extension",
+        "mirrors",
+    )
+
+    def __init__(self, **attrs: Any) -> None:
         """Constructs a new Publication.
 
+        Attributes which aren't given are None, and attributes which aren't in
+        '__slots__' raise a TypeError. 'mirrors' is a tuple of (name, URL) pairs
+        from where the publication can be downloaded; the MirrorDownloaders
+        are only constructed when the publication is downloaded.
+
         :Example:
 
-        attrs = {'author': 'Fernando Pessoa', 'title': 'O Livro do Desassossego"}
+        attrs = {'authors': 'Fernando Pessoa', 'title': 'O Livro do Desassossego'}
         Publication(**attrs)
 
-        :param attrs: a Dict of attributes
+        :param attrs: the attributes of the publication
         :rtype: None"""
-        self.attrs = attrs
+        for field in self.__slots__:
+            setattr(self, field, attrs.pop(field, None))
+        if attrs:
+            raise TypeError(f"Unknown Publication attributes: {', '.join(attrs)}.")
 
     @property
-    def attributes(self):
-        return self.attrs
+    def attributes(self) -> Dict[str, Any]:
+        return {
+            field: getattr(self, field)
+            for field in self.__slots__
+            if getattr(self, field) is not None
+        }
 
     @property
-    def fields(self):
-        return self.attrs.keys()
+    def fields(self) -> KeysView[str]:
+        return self.attributes.keys()
 
     @property
-    def values(self):
+    def values(self) -> ValuesView[Any]:
         """Returns a list containing the values of every field in the object."""
-        return self.attrs.values()
-
-    def __getattr__(self, attr) -> Optional[Any]:
-        return self.attrs.get(attr)
+        return self.attributes.values()
 
     def filename(self) -> Optional[str]:
-        ext = self.attrs.get("extension")  # required
+        ext = self.extension  # required
         if ext is None:
             return None
-        title = self.attrs.get("title")  # optional
+        title = self.title  # optional
         # if title is None, generate random filename
         if title is None:
             random_filename = random_string(15)
             return f"{random_filename}.{ext}"
-        year = self.attrs.get("year")  # optional
+        year = self.year  # optional
         if year:
-            authors = self.attrs.get("authors")  # optional
+            authors = self.authors  # optional
             if authors:
                 return f"{title} ({year}) - {authors}.{ext}"
             else:
@@ -54,8 +79,8 @@ class Publication(object):
         return f"{title}.{ext}"
 
     def __repr__(self) -> str:
-        attrs = ", ".join([f"{a!r}: {v}" for (a, v) in self.attrs.items()])
+        attrs = ", ".join([f"{a!r}: {v}" for (a, v) in self.attributes.items()])
         return f"{self.__class__.__name__}({attrs})"
 
     def __len__(self) -> int:
-        return len(self.attrs)
+        return len(self.attributes)
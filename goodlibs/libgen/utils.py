@@ -12,3 +12,12 @@ def random_string(length: int, character_set: str = string.ascii_lowercase) -> s
     consisting of characters from 'character_set'."""
     letters = [random.choice(character_set) for _ in range(length)]
     return "".join(letters)
+
+
+def format_size(size: int) -> str:
+    """Returns 'size' in bytes as a human readable string, like Libgen does."""
+    for unit in ("bytes", "Kb", "Mb"):
+        if size < 1024:
+            return f"{size} {unit}"
+        size //= 1024
+    return f"{size} Gb"
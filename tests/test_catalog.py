@@ -0,0 +1,92 @@
+import pytest
+
+from goodlibs.libgen.catalog import Catalog, parse_dump, parse_values
+
+CREATE_TABLE = """CREATE TABLE `updated` (
+  `ID` int(15) unsigned NOT NULL AUTO_INCREMENT,
+  `Title` varchar(2000) DEFAULT '',
+  `Author` varchar(1000) DEFAULT '',
+  `Language` varchar(150) DEFAULT '',
+  `IdentifierWODash` varchar(300) DEFAULT '',
+  `Extension` varchar(50) DEFAULT '',
+  `MD5` char(32) DEFAULT NULL,
+  `TimeLastModified` timestamp NOT NULL,
+  PRIMARY KEY (`ID`)
+) ENGINE=MyISAM DEFAULT CHARSET=utf8;
+"""
+
+DUMP = CREATE_TABLE + (
+    "INSERT INTO `updated` VALUES "
+    "(1,'Dune','Frank Herbert','English','9780441172719,0441172717','djvu','aaa',"
+    "'2020-01-01 00:00:00'),"
+    "(2,'Dune','Frank Herbert','English','','epub','bbb','2020-01-01 00:00:00'),"
+    "(3,'Children of Dune','Frank Herbert','English',NULL,'epub','ccc','2020-01-01 00:00:00'),"
+    "(4,'Dune','Frank Herbert','English','','epub',NULL,'2020-01-01 00:00:00');\n"
+)
+
+
+@pytest.fixture()
+def catalog(tmp_path):
+    catalog = Catalog(str(tmp_path / "catalog.sqlite"))
+    catalog.import_dump(DUMP.splitlines(keepends=True))
+    yield catalog
+    catalog.close()
+
+
+def test_parse_values_escaped_quotes():
+    rows = list(parse_values(r"(1,'It\'s','It''s','say \"hi\"\n');"))
+    assert rows == [["1", "It's", "It's", 'say "hi"\n']]
+
+
+def test_parse_values_punctuation_in_strings():
+    rows = list(parse_values("(1,'Dune (Part 1), Book; One'),(2,'a,b')"))
+    assert rows == [["1", "Dune (Part 1), Book; One"], ["2", "a,b"]]
+
+
+def test_parse_values_null():
+    rows = list(parse_values("(1,NULL,'NULL','')"))
+    assert rows == [["1", None, "NULL", ""]]
+
+
+def test_parse_dump_columns():
+    rows = list(parse_dump(DUMP.splitlines(keepends=True)))
+    assert len(rows) == 4
+    assert rows[2]["Title"] == "Children of Dune"
+    assert rows[2]["IdentifierWODash"] is None
+
+
+def test_parse_dump_without_columns():
+    with pytest.raises(ValueError):
+        list(parse_dump(["INSERT INTO `updated` VALUES (1,'Dune');\n"]))
+
+
+def test_reimport_same_dump(catalog):
+    assert catalog.import_dump(DUMP.splitlines(keepends=True)) == 0
+
+
+def test_import_newer_dump(catalog):
+    dump = CREATE_TABLE + (
+        "INSERT INTO `updated` VALUES "
+        "(2,'Dune Messiah','Frank Herbert','English','','epub','bbb','2021-01-01 00:00:00'),"
+        "(3,'Old','Frank Herbert','English','','epub','ccc','2019-01-01 00:00:00');\n"
+    )
+    assert catalog.import_dump(dump.splitlines(keepends=True)) == 1
+    assert [row["id"] for row in catalog.search("messiah")] == [2]
+    assert catalog.search("old") == []
+
+
+def test_search_full_text(catalog):
+    assert [row["id"] for row in catalog.search("frank herbert children dune")] == [3]
+    assert sorted(row["id"] for row in catalog.search("herbert dune")) == [1, 2, 3]
+    assert catalog.search("asimov") == []
+
+
+def test_search_without_md5(catalog):
+    assert 4 not in [row["id"] for row in catalog.search("frank herbert dune")]
+
+
+def test_search_isbn_first(catalog):
+    rows = catalog.search("frank herbert dune", isbns=["978-0-441-17271-9"])
+    assert rows[0]["id"] == 1
+    assert sorted(row["id"] for row in rows) == [1, 2, 3]
+    assert [row["id"] for row in catalog.search("", isbns=["0441172717"])] == [1]
@@ -0,0 +1,135 @@
+import pytest
+
+from goodlibs.goodreads.book import Book
+from goodlibs.libgen.catalog import Catalog
+from goodlibs.libgen import downloaders
+from goodlibs.libgen.mirrors import GenLibRusEc, LocalCatalog, SearchCache
+from goodlibs.libgen.publication import Publication
+
+DUMP = """CREATE TABLE `updated` (
+  `ID` int(15) unsigned NOT NULL AUTO_INCREMENT,
+  `Title` varchar(2000) DEFAULT '',
+  `Author` varchar(1000) DEFAULT '',
+  `Language` varchar(150) DEFAULT '',
+  `IdentifierWODash` varchar(300) DEFAULT '',
+  `Extension` varchar(50) DEFAULT '',
+  `MD5` char(32) DEFAULT NULL,
+  `TimeLastModified` timestamp NOT NULL,
+  PRIMARY KEY (`ID`)
+) ENGINE=MyISAM DEFAULT CHARSET=utf8;
+INSERT INTO `updated` VALUES \
+(1,'Dune','Frank Herbert','Russian','','epub','aaa','2020-01-01 00:00:00'),\
+(2,'Children of Dune','Frank Herbert','English','','epub','bbb','2020-01-01 00:00:00'),\
+(3,'Dune Messiah','Frank Herbert','English','9780441172696','pdf','ccc','2020-01-01 00:00:00');
+"""
+
+
+@pytest.fixture()
+def catalog(tmp_path):
+    catalog = Catalog(str(tmp_path / "catalog.sqlite"))
+    catalog.import_dump(DUMP.splitlines(keepends=True))
+    yield catalog
+    catalog.close()
+
+
+def book(title, isbn13=None):
+    return Book(
+        {
+            "title_without_series": title,
+            "authors": {"author": {"name": "Frank Herbert"}},
+            "isbn13": isbn13 if isbn13 is not None else {"@nil": "true"},
+        }
+    )
+
+
+def test_author_search_selects_title(catalog):
+    books = [book("Children of Dune"), book("Dune Messiah")]
+    searches = SearchCache(books, by_author=True)
+    mirror = LocalCatalog(books[0], catalog)
+    selected = searches.select_result(mirror, "English", ("epub",))
+    assert selected.title == "Children of Dune"
+    assert list(searches.results) == [("frank herbert", ())]
+
+
+def test_author_search_ignores_subtitles(catalog):
+    books = [book("Dune Messiah: Dune Chronicles 2"), book("Dune")]
+    searches = SearchCache(books, by_author=True)
+    selected = searches.select_result(LocalCatalog(books[0], catalog), "English", ("pdf",))
+    assert selected.title == "Dune Messiah"
+    assert list(searches.results) == [("frank herbert", ())]
+
+
+def test_author_search_falls_back_for_other_titles(catalog):
+    dune = book("Dune")
+    searches = SearchCache([dune, book("Dune Messiah")], by_author=True)
+    searches.select_result(LocalCatalog(dune, catalog), "English", ("epub",))
+    # "Children of Dune" contains the title, but isn't the same book.
+    assert list(searches.results) == [("frank herbert", ()), (str(dune), ())]
+
+
+def test_author_search_without_title(tmp_path):
+    catalog = Catalog(str(tmp_path / "catalog.sqlite"))
+    catalog.import_dump(
+        DUMP.splitlines(keepends=True)[:-1]
+        + [
+            "INSERT INTO `updated` VALUES (1,'','Frank Herbert','English','','epub','aaa','2020');\n"
+        ]
+    )
+    dune = book("Dune")
+    searches = SearchCache([dune, book("Dune Messiah")], by_author=True)
+    searches.select_result(LocalCatalog(dune, catalog), "English", ("epub",))
+    assert list(searches.results) == [("frank herbert", ()), (str(dune), ())]
+    catalog.close()
+
+
+def test_author_search_tries_isbns_first(catalog):
+    books = [book("Dune Messiah", isbn13="978-0-441-17269-6"), book("Dune")]
+    searches = SearchCache(books, by_author=True)
+    mirror = LocalCatalog(books[0], catalog)
+    selected = searches.select_result(mirror, "English", ("epub", "pdf"))
+    assert selected.title == "Dune Messiah"
+    assert list(searches.results) == [("", ("978-0-441-17269-6",))]
+
+
+def test_author_search_needs_several_books(catalog):
+    children = book("Children of Dune")
+    searches = SearchCache([children], by_author=True)
+    searches.select_result(LocalCatalog(children, catalog), "English", ("epub",))
+    assert list(searches.results) == [(str(children), ())]
+
+
+def test_author_search_page_limit(catalog):
+    books = [book("Children of Dune"), book("Dune Messiah")]
+    searches = SearchCache(books, by_author=True, max_author_pages=2)
+    mirror = LocalCatalog(books[0], catalog)
+    mirror.page_size = 1
+    searches.select_result(mirror, "English", ("epub",))
+    assert len(searches.results[("frank herbert", ())]) == 2
+
+
+def test_same_search_is_made_once(catalog):
+    searches = SearchCache()
+    first = searches.select_result(
+        LocalCatalog(book("Children of Dune"), catalog), "English", ("epub",)
+    )
+    second = searches.select_result(
+        LocalCatalog(book("Children of Dune"), catalog), "English", ("epub",)
+    )
+    assert first is second
+    assert len(searches.results) == 1
+
+
+def test_download_builds_only_used_downloaders(monkeypatch):
+    built = []
+
+    class Downloader:
+        def __init__(self, url, logger):
+            built.append(url)
+
+        def download_publication(self, session, publication):
+            pass
+
+    monkeypatch.setattr(downloaders, "DOWNLOADERS", {"a": Downloader, "b": Downloader})
+    publication = Publication(title="Dune", mirrors=(("a", "http://a"), ("b", "http://b")))
+    GenLibRusEc(book("Dune")).download(publication)
+    assert built == ["http://a"]
@@ -0,0 +1,22 @@
+import pytest
+
+from goodlibs.libgen.publication import Publication
+
+
+def test_keyword_construction():
+    publication = Publication(authors="Fernando Pessoa", title="O Livro do Desassossego")
+    assert publication.authors == "Fernando Pessoa"
+    assert publication.title == "O Livro do Desassossego"
+    assert publication.year is None
+
+
+def test_unknown_attribute():
+    with pytest.raises(TypeError):
+        Publication(author="Fernando Pessoa")
+
+
+def test_attributes_skip_none():
+    publication = Publication(title="O Livro do Desassossego", year=None, extension="epub")
+    assert publication.attributes == {"title": "O Livro do Desassossego", "extension": "epub"}
+    assert len(publication) == 2
+    assert publication.filename() == "O Livro do Desassossego.epub"